@@ -1,7 +1,85 @@
 import os
+import asyncio
 import logging
+import struct
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+# Scans finishing less than this many seconds ago are reused as-is
+SCAN_REUSE_TIME = 1.0
+# Seconds the aplay -l device list is reused by the info endpoint
+AUDIO_INFO_TTL = 30.0
+# RIFF chunk id, chunk size and form type at the start of a WAV file
+WAV_HEADER = struct.Struct('<4sI4s')
+
+
+def _is_wav_fd(fd: int) -> bool:
+    """Check an open file for a RIFF/WAVE header"""
+    header = os.pread(fd, WAV_HEADER.size, 0)
+    if len(header) != WAV_HEADER.size:
+        return False
+    riff, _, form = WAV_HEADER.unpack(header)
+    return riff == b'RIFF' and form == b'WAVE'
+
+
+def _iter_wavs(root: str) -> Iterator[os.DirEntry]:
+    """Recursively yield .wav file entries below root using os.scandir"""
+    stack = [root]
+    while stack:
+        path = stack.pop()
+        try:
+            it = os.scandir(path)
+        except OSError as e:
+            if path == root:
+                raise
+            # Skip unreadable subdirectories such as lost+found
+            logging.debug("Skipping sound directory %s: %s", path, e)
+            continue
+        with it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif (entry.name.endswith('.wav') and
+                      entry.is_file(follow_symlinks=False)):
+                    yield entry
+
+
+def _scan_dir(path: str,
+              root: str) -> Tuple[List[os.DirEntry], List[str]]:
+    """Return the .wav file entries and subdirectory paths of one directory"""
+    files: List[os.DirEntry] = []
+    subdirs: List[str] = []
+    try:
+        it = os.scandir(path)
+    except OSError as e:
+        if path == root:
+            raise
+        # Skip unreadable subdirectories such as lost+found
+        logging.debug("Skipping sound directory %s: %s", path, e)
+        return files, subdirs
+    with it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append(entry.path)
+            elif (entry.name.endswith('.wav') and
+                  entry.is_file(follow_symlinks=False)):
+                files.append(entry)
+    return files, subdirs
+
+
+def _iter_wavs_parallel(root: str, workers: int) -> Iterator[os.DirEntry]:
+    """Recursively yield .wav file entries, scanning directories concurrently"""
+    with ThreadPoolExecutor(max_workers=workers,
+                            thread_name_prefix='sound_scan') as pool:
+        pending = {pool.submit(_scan_dir, root, root)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                files, subdirs = future.result()
+                for path in subdirs:
+                    pending.add(pool.submit(_scan_dir, path, root))
+                yield from files
 
 
 class SoundSystemService:
@@ -13,8 +91,22 @@ class SoundSystemService:
         self.sound_dir = Path(config.get('sound_directory',
                                          '~/lister_sound_system/sounds')).expanduser().resolve()
 
+        # Header validation is optional, the .wav extension already filters
+        self.verify_headers = config.getboolean('verify_wav_header', False)
+
+        # Number of threads walking the sound directory (1 = serial walk)
+        self.scan_workers = config.getint('scan_workers', 1, minval=1)
+
         # Initialize sound cache
         self._sound_cache: Dict[str, str] = {}
+        # Header check results keyed by path: (mtime_ns, size, valid)
+        self._verify_cache: Dict[str, Tuple[int, int, bool]] = {}
+        # Sound name, file name and path lookups built from the last scan
+        self._resolve_map: Dict[str, str] = {}
+        self._scan_lock = asyncio.Lock()
+        self._last_scan: Optional[float] = None
+        # (timestamp, info) of the last aplay -l run
+        self._audio_cache: Tuple[float, Optional[Dict[str, Any]]] = (0.0, None)
 
         # Register API endpoints
         self.server.register_endpoint(
@@ -34,50 +126,119 @@ class SoundSystemService:
         self.server.register_event_handler(
             "server:klippy_ready", self._handle_ready)
 
-        logging.info(f"Sound System Service initialized with dir: {self.sound_dir}")
+        logging.info("Sound System Service initialized with dir: %s", self.sound_dir)
 
-    def _verify_sound_file(self, path: Path) -> bool:
-        """Verify if file exists and is a valid WAV file"""
+    def _verify_sound_file(self, entry: os.DirEntry) -> bool:
+        """Verify if file is a valid WAV file, reusing cached results"""
         try:
-            if not path.is_file():
-                return False
-
-            # Basic WAV header check
-            with open(path, 'rb') as f:
-                header = f.read(12)
-                return (header.startswith(b'RIFF') and
-                        header[8:12] == b'WAVE')
+            st = entry.stat()
+            cached = self._verify_cache.get(entry.path)
+            if (cached is not None and
+                    cached[:2] == (st.st_mtime_ns, st.st_size)):
+                return cached[2]
+
+            # Basic WAV header check, a raw read skips the buffered reader
+            fd = os.open(entry.path, os.O_RDONLY | os.O_CLOEXEC)
+            try:
+                valid = _is_wav_fd(fd)
+            finally:
+                os.close(fd)
+            self._verify_cache[entry.path] = (st.st_mtime_ns, st.st_size, valid)
+            return valid
         except Exception as e:
-            logging.error(f"Error verifying sound file {path}: {e}")
+            logging.error("Error verifying sound file %s: %s", entry.path, e)
             return False
 
-    async def _scan_sounds(self) -> Dict[str, str]:
-        """Scan sound directory and update cache"""
+    def _scan_sync(self) -> Dict[str, str]:
+        """Walk the sound directory and collect valid WAV files"""
         sounds: Dict[str, str] = {}
 
-        try:
-            if not self.sound_dir.exists():
-                logging.warning(f"Sound directory not found: {self.sound_dir}")
-                return sounds
-
-            # Scan for WAV files
-            for file_path in self.sound_dir.glob("**/*.wav"):
-                if self._verify_sound_file(file_path):
-                    sounds[file_path.stem] = str(file_path)
-
-            self._sound_cache = sounds
-
-            # Notify clients
-            await self.server.send_event(
-                "sound_system:sounds_updated",
-                {'sounds': sounds}
-            )
-
-        except Exception as e:
-            logging.exception(f"Error scanning sounds: {e}")
+        if not self.sound_dir.exists():
+            logging.warning("Sound directory not found: %s", self.sound_dir)
+            return sounds
+
+        # Scan for WAV files
+        root = str(self.sound_dir)
+        if self.scan_workers > 1:
+            entries = _iter_wavs_parallel(root, self.scan_workers)
+        else:
+            entries = _iter_wavs(root)
+
+        seen = set()
+        for entry in entries:
+            seen.add(entry.path)
+            if self.verify_headers and not self._verify_sound_file(entry):
+                continue
+            # Walk order varies, so duplicate names keep the first path in
+            # sort order to give the same result on every scan
+            name = os.path.splitext(entry.name)[0]
+            current = sounds.get(name)
+            if current is None or entry.path < current:
+                sounds[name] = entry.path
+
+        # Drop cached header checks for files that have gone away
+        for path in self._verify_cache.keys() - seen:
+            del self._verify_cache[path]
 
         return sounds
 
+    async def _scan_sounds(self) -> Dict[str, str]:
+        """Scan sound directory and update cache"""
+        # Overlapping scan requests wait here and reuse the fresh result
+        async with self._scan_lock:
+            loop = asyncio.get_event_loop()
+            if (self._last_scan is not None and
+                    loop.time() - self._last_scan < SCAN_REUSE_TIME):
+                return self._sound_cache
+
+            sounds: Dict[str, str] = {}
+
+            try:
+                # Keep directory I/O off the event loop
+                sounds = await loop.run_in_executor(None, self._scan_sync)
+                self._last_scan = loop.time()
+
+                if sounds == self._sound_cache:
+                    return sounds
+
+                self._sound_cache = sounds
+                self._resolve_map = self._build_resolve_map(sounds)
+
+                # Notify clients
+                await self.server.send_event(
+                    "sound_system:sounds_updated",
+                    {'sounds': sounds}
+                )
+
+            except Exception as e:
+                logging.exception("Error scanning sounds: %s", e)
+
+            return sounds
+
+    def _build_resolve_map(self, sounds: Dict[str, str]) -> Dict[str, str]:
+        """Map every accepted spelling of a sound to its path"""
+        resolve_map: Dict[str, str] = {}
+        for stem, path in sounds.items():
+            resolve_map[stem] = path
+            resolve_map[stem + '.wav'] = path
+            resolve_map[path] = path
+        return resolve_map
+
+    def _resolve_sound(self, sound: str) -> str:
+        """Resolve a requested sound to the name passed to PLAY_SOUND"""
+        path = self._resolve_map.get(sound)
+        if path is None:
+            # Unknown to the last scan, let Klipper do its own lookup
+            return sound
+        # Klipper looks sounds up relative to its sound directory; the
+        # exact file name lets it hit on the first candidate
+        rel = os.path.relpath(path, self.sound_dir)
+        if os.path.isabs(rel) or rel.split(os.sep, 1)[0] == os.pardir:
+            # Outside this directory, e.g. through a symlink. Klipper's
+            # sound_directory is configured separately, pass the request on
+            return sound
+        return rel
+
     async def _handle_ready(self) -> None:
         """Initialize when Klippy is ready"""
         logging.info("Sound System Service Ready")
@@ -100,11 +261,11 @@ class SoundSystemService:
         if not sound:
             raise self.server.error("No sound specified")
 
-        logging.info(f"Received play request for sound: {sound}")
+        logging.info("Received play request for sound: %s", sound)
 
         try:
             # Attempt to play sound through Klipper
-            cmd = f"PLAY_SOUND SOUND={sound}"
+            cmd = f"PLAY_SOUND SOUND={self._resolve_sound(sound)}"
             await self.klippy.run_method(
                 "gcode/script",
                 {"script": cmd}
@@ -122,7 +283,7 @@ class SoundSystemService:
             }
 
         except Exception as e:
-            logging.exception(f"Failed to play sound {sound}")
+            logging.exception("Failed to play sound %s", sound)
             raise self.server.error(f"Failed to play sound: {str(e)}")
 
     async def _handle_scan_request(self, web_request) -> Dict[str, Any]:
@@ -134,29 +295,50 @@ class SoundSystemService:
             'sound_dir': str(self.sound_dir)
         }
 
-    async def _handle_info_request(self, web_request) -> Dict[str, Any]:
-        """Return information about the sound system"""
+    async def _get_audio_info(self, refresh: bool = False) -> Dict[str, Any]:
+        """Return the aplay -l device list, cached for a short time"""
+        loop = asyncio.get_event_loop()
+        cached_at, cached_info = self._audio_cache
+        if (not refresh and cached_info is not None and
+                loop.time() - cached_at < AUDIO_INFO_TTL):
+            return cached_info
+
         audio_info = {'devices': []}
 
         try:
             # Get audio device information using aplay -l
-            import asyncio
             proc = await asyncio.create_subprocess_exec(
                 'aplay', '-l',
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE
             )
-            stdout, _ = await proc.communicate()
+            stdout, stderr = await proc.communicate()
+
+            if proc.returncode != 0:
+                # Leave the cache alone so the next request retries
+                logging.error("aplay -l failed: %s",
+                              stderr.decode('utf-8', 'replace').strip())
+                return audio_info
 
             if stdout:
+                # Filter on bytes first, only matching lines get decoded
                 audio_info['devices'] = [
-                    line.decode().strip()
-                    for line in stdout.splitlines()
+                    line.rstrip(b'\r').decode('utf-8', 'replace')
+                    for line in stdout.split(b'\n')
                     if b'card' in line
                 ]
 
+            self._audio_cache = (loop.time(), audio_info)
+
         except Exception as e:
-            logging.error(f"Error getting audio info: {e}")
+            logging.error("Error getting audio info: %s", e)
+
+        return audio_info
+
+    async def _handle_info_request(self, web_request) -> Dict[str, Any]:
+        """Return information about the sound system"""
+        refresh = web_request.get_boolean('refresh', False)
+        audio_info = await self._get_audio_info(refresh)
 
         return {
             'status': 'online',
@@ -168,6 +350,8 @@ class SoundSystemService:
     async def close(self) -> None:
         """Clean up resources"""
         self._sound_cache.clear()
+        self._verify_cache.clear()
+        self._resolve_map.clear()
 
 
 def load_component(config):
@@ -1,12 +1,69 @@
 import logging
+import logging.handlers
+import atexit
+import functools
+import json
+import math
+import queue
+import re
+import shutil
+import socket
+import struct
 import subprocess
 from pathlib import Path
-from threading import Thread
-from typing import Optional
-import psutil
-import signal
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+import stat
 import os
 
+try:
+    import alsaaudio
+except ImportError:
+    alsaaudio = None
+
+# Executable paths, resolved once per process with an in-process PATH scan
+APLAY_PATH = shutil.which('aplay')
+AMIXER_PATH = shutil.which('amixer')
+MPV_PATH = shutil.which('mpv')
+
+# Seconds a single sound may play before aplay is killed
+PLAY_TIMEOUT = 30.0
+# Seconds between exit checks when aplay cannot be watched with a pidfd
+REAP_INTERVAL = 0.1
+# Widest dB range, in 1/100 dB, that amixer -M still maps linearly
+MAX_LINEAR_DB_SCALE = 2400
+# ALSA's dB value for a control whose minimum mutes (SND_CTL_TLV_DB_GAIN_MUTE)
+DB_GAIN_MUTE = -9999999
+# Seconds an amixer call may take before it is given up on
+AMIXER_TIMEOUT = 5.0
+# Seconds amixer volume writes are held back to coalesce rapid presses
+VOLUME_WRITE_DELAY = 0.05
+# Volume percentage in 'amixer sget' output, e.g. '[75%]'
+AMIXER_VOLUME_RE = re.compile(rb'\[(\d+)%\]')
+# RIFF chunk id, chunk size and form type at the start of a WAV file
+WAV_HEADER = struct.Struct('<4sI4s')
+# IPC socket of the persistent mpv used for radio streams, kept in the
+# user's own printer_data tree rather than world-writable /tmp
+MPV_SOCKET = '~/printer_data/comms/lister_mpv.sock'
+MPV_IPC_TIMEOUT = 0.5
+MPV_STOP_COMMAND = b'{"command": ["stop"]}\n'
+
+
+@functools.lru_cache(maxsize=256)
+def _read_wav_header(path: str, mtime_ns: int, size: int) -> bool:
+    """Check a file version for a RIFF/WAVE header"""
+    # mtime_ns and size only key the cache, a rewritten file misses it.
+    # Raw fd read, no buffered reader pulling in 8 KiB for 12 bytes
+    fd = os.open(path, os.O_RDONLY | os.O_CLOEXEC)
+    try:
+        header = os.pread(fd, WAV_HEADER.size, 0)
+    finally:
+        os.close(fd)
+    if len(header) != WAV_HEADER.size:
+        return False
+    riff, _, form = WAV_HEADER.unpack(header)
+    return riff == b'RIFF' and form == b'WAVE'
+
 
 class SoundSystem:
     def __init__(self, config):
@@ -19,31 +76,68 @@ class SoundSystem:
 
         # Configure paths
         self.sound_dir = Path(config.get('sound_directory',
-                                         '/home/pi/lister_sound_system/sounds')).resolve()
-        self.logger.info(f"Sound directory: {self.sound_dir}")
+                                         '/home/pi/lister_sound_system/sounds')).expanduser().resolve()
+        self.logger.info("Sound directory: %s", self.sound_dir)
+
+        # Last SOUND_LIST body and the (name, mtime, size) it was built from
+        self._list_cache: Tuple[tuple, str] = ((), "")
+        # Verified WAV files at the top of sound_dir, rebuilt on mtime change
+        self._sound_index: Dict[str, str] = {}
+        self._index_mtime = None
+        # Resolved names in subdirectories, valid while their directory is
+        # unchanged
+        self._resolve_cache: Dict[str, Tuple[int, str]] = {}
+        # Lookups join plain strings, no Path objects on the play path
+        self._sound_dir_str = os.fspath(self.sound_dir)
 
         # Volume control configuration
         self.volume_step = config.getint('volume_step', 5)  # Default 5% steps
         self.max_volume = config.getint('max_volume', 100)
         self.min_volume = config.getint('min_volume', 0)
-        self._current_volume = None  # Will be initialized when first needed
-
-        # Find aplay and amixer
-        self.aplay_path = self._get_aplay_path()
-        self.amixer_path = self._get_amixer_path()
+        self.mixer_control = config.get('mixer_control', 'PCM')
+        self._current_volume = None  # Read from the mixer on first adjustment
+        self._volume_write_pending = False
+        self._volume_timer = self.printer.get_reactor().register_timer(
+            self._flush_volume)
+
+        # Find aplay and a mixer, amixer is only needed without pyalsaaudio
+        self.aplay_path = APLAY_PATH
+        # dB range for mapping percentages like amixer -M, None for linear
+        self._mixer_db_range = None
+        self._mixer = self._open_mixer()
+        self.amixer_path = AMIXER_PATH
         if not self.aplay_path:
             self.logger.error("'aplay' not found in system path")
             return
-        if not self.amixer_path:
+        if self._mixer is None and not self.amixer_path:
             self.logger.error("'amixer' not found in system path")
             return
-
-        # Initialize volume state
-        self._init_volume_state()
+        # A smaller ALSA buffer lets aplay start sooner, 0 keeps the
+        # device default
+        self.aplay_buffer_us = config.getint('aplay_buffer_us', 40000,
+                                             minval=0)
+        self.aplay_period_us = config.getint('aplay_period_us', 10000,
+                                             minval=0)
+        # Fixed part of the aplay command line, only the file varies. -q
+        # drops the banner aplay would otherwise write to the stderr pipe.
+        # -t wav makes aplay reject a file that is not a WAV by the time
+        # it is played, instead of playing it as raw 8 kHz samples
+        argv = [self.aplay_path, '-q', '-t', 'wav', '-D', 'plughw:0,0']
+        if self.aplay_buffer_us:
+            argv.append(f'--buffer-time={self.aplay_buffer_us}')
+        if self.aplay_period_us:
+            argv.append(f'--period-time={self.aplay_period_us}')
+        self._aplay_argv = tuple(argv)
+        # Optional nice value for aplay, negative values need CAP_SYS_NICE
+        self.aplay_priority = config.getint('aplay_priority', None,
+                                            minval=-20, maxval=19)
 
         # Stream handling
-        self.mpv_path = self._get_mpv_path()
+        self.mpv_path = MPV_PATH
+        self.mpv_socket = os.path.expanduser(config.get('mpv_socket',
+                                                        MPV_SOCKET))
         self._stream_process = None
+        self._streaming = False
         
         # Get streams from config
         default_streams = "\n".join([
@@ -58,6 +152,10 @@ class SoundSystem:
             self.logger.warning("No radio streams configured")
         
         self.current_stream_index = 0
+        # The loadfile command for each stream only changes with the config
+        self._stream_commands = [
+            self._encode_mpv_command(['loadfile', url, 'replace'])
+            for url in self.stream_urls]
         self.last_stream_stop_time = None
         self.stream_switch_timeout = config.getint('stream_switch_timeout', 60)  # Default 60 seconds
 
@@ -67,152 +165,462 @@ class SoundSystem:
         self.gcode.register_command('SOUND_LIST', self.cmd_SOUND_LIST,
                                     desc="List available sound files")
         self.gcode.register_command('VOLUME_UP', self.cmd_VOLUME_UP,
-                                    desc=f"Increase PCM volume by {self.volume_step}%")
+                                    desc=f"Increase {self.mixer_control} volume by {self.volume_step}%")
         self.gcode.register_command('VOLUME_DOWN', self.cmd_VOLUME_DOWN,
-                                    desc=f"Decrease PCM volume by {self.volume_step}%")
+                                    desc=f"Decrease {self.mixer_control} volume by {self.volume_step}%")
         self.gcode.register_command('STREAM_RADIO', self.cmd_STREAM_RADIO,
                                   desc="Toggle radio stream playback")
+        self.printer.register_event_handler("klippy:disconnect",
+                                            self._handle_disconnect)
 
         # Add sound playback state tracking
         self._sound_playing = False
+        self._sound_process = None
+        self._refresh_index()
+
+        # One worker for file I/O kept off the reactor thread (listing,
+        # preloading), so repeated SOUND_LIST calls queue instead of
+        # starting a thread each
+        self._io_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix='sound_system')
+
+        # Warm the page cache with the sound files once Klipper is ready
+        self.preload_sounds = config.getboolean('preload_sounds', True)
+        if self.preload_sounds:
+            self.printer.register_event_handler("klippy:ready",
+                                                self._handle_ready)
+
+    def _handle_ready(self):
+        """Start preloading sound files in the background"""
+        self._io_executor.submit(self._preload_sound_files)
+
+    def _preload_sound_files(self):
+        """Ask the kernel to read every sound file into the page cache"""
+        count = 0
+        try:
+            with os.scandir(self.sound_dir) as it:
+                for entry in it:
+                    if not (entry.name.endswith('.wav') and entry.is_file()):
+                        continue
+                    # One unreadable or vanished file must not stop the rest
+                    try:
+                        fd = os.open(entry.path, os.O_RDONLY)
+                        try:
+                            if hasattr(os, 'posix_fadvise'):
+                                os.posix_fadvise(fd, 0, 0,
+                                                 os.POSIX_FADV_WILLNEED)
+                            else:
+                                while os.read(fd, 65536):
+                                    pass
+                        finally:
+                            os.close(fd)
+                    except OSError as e:
+                        self.logger.error("Error preloading %s: %s",
+                                          entry.path, e)
+                        continue
+                    count += 1
+            self.logger.info("Preloaded %d sound files", count)
+        except Exception as e:
+            self.logger.error("Error preloading sound files: %s", e)
+
+    def _open_mixer(self):
+        """Open the mixer control in-process through pyalsaaudio, if installed"""
+        if alsaaudio is None:
+            return None
+        try:
+            mixer = alsaaudio.Mixer(self.mixer_control)
+        except alsaaudio.ALSAAudioError as e:
+            self.logger.warning("ALSA mixer unavailable, using amixer: %s", e)
+            return None
+        self._mixer_db_range = self._get_db_range(mixer)
+        return mixer
+
+    def _get_db_range(self, mixer) -> Optional[Tuple[int, int]]:
+        """Return the dB range volumes are mapped over, None for linear"""
+        # Same rules as amixer -M: controls without dB information or
+        # spanning at most MAX_LINEAR_DB_SCALE use a linear scale
+        try:
+            min_db, max_db = mixer.getrange(units=alsaaudio.VOLUME_UNITS_DB)
+        except (AttributeError, TypeError):
+            self.logger.warning("pyalsaaudio older than 0.10, volume "
+                                "percentages are not mapped like amixer -M")
+            return None
+        except alsaaudio.ALSAAudioError:
+            return None
+        if max_db - min_db <= MAX_LINEAR_DB_SCALE:
+            return None
+        return min_db, max_db
+
+    def _get_mixer_volume(self) -> int:
+        """Read the mixer volume on the amixer -M percentage scale"""
+        if self._mixer_db_range is None:
+            return self._mixer.getvolume()[0]
+        min_db, max_db = self._mixer_db_range
+        value = self._mixer.getvolume(units=alsaaudio.VOLUME_UNITS_DB)[0]
+        normalized = 10 ** ((value - max_db) / 6000.0)
+        if min_db != DB_GAIN_MUTE:
+            min_norm = 10 ** ((min_db - max_db) / 6000.0)
+            normalized = (normalized - min_norm) / (1 - min_norm)
+        return max(0, min(100, round(normalized * 100)))
+
+    def _set_mixer_volume(self, volume: int):
+        """Set the mixer volume from an amixer -M percentage"""
+        if self._mixer_db_range is None:
+            self._mixer.setvolume(volume)
+            return
+        min_db, max_db = self._mixer_db_range
+        normalized = volume / 100.0
+        if min_db != DB_GAIN_MUTE:
+            min_norm = 10 ** ((min_db - max_db) / 6000.0)
+            normalized = normalized * (1 - min_norm) + min_norm
+        if normalized <= 0:
+            value = min_db
+        else:
+            value = max(min_db, round(6000.0 * math.log10(normalized)) + max_db)
+        self._mixer.setvolume(value, units=alsaaudio.VOLUME_UNITS_DB)
 
     def _init_volume_state(self):
         """Initialize volume state by getting current system volume"""
+        if self._mixer is not None:
+            try:
+                self._current_volume = self._get_mixer_volume()
+                self.logger.info("Initial volume state: %d%%", self._current_volume)
+            except alsaaudio.ALSAAudioError as e:
+                self.logger.error("Error getting initial volume state: %s", e)
+                self._current_volume = 50  # Default to 50% if the mixer fails
+            return
+
+        # amixer runs on the I/O worker, completion.wait() lets the reactor
+        # keep serving other work while this command waits for the result
+        reactor = self.printer.get_reactor()
+        completion = reactor.completion()
+
+        def read_volume():
+            reactor.async_complete(completion, self._amixer_get())
+
+        self._io_executor.submit(read_volume)
+        volume = completion.wait(reactor.monotonic() + AMIXER_TIMEOUT + 1.)
+        if volume is None:
+            self.logger.error("Volume read timeout")
+            volume = 50  # Default to 50% if the worker did not answer
+        self._current_volume = volume
+        self.logger.info("Initial volume state: %d%%", volume)
+
+    def _amixer_get(self) -> int:
+        """Read the volume through amixer, 50% if it cannot be read"""
         try:
-            cmd = [self.amixer_path, '-M', 'sget', 'PCM']
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            if result.returncode == 0:
-                # Parse the output to get current volume percentage
-                output = result.stdout
-                if 'Mono:' in output:
-                    try:
-                        # Find the line with 'Mono: Playback'
-                        mono_line = [line for line in output.split('\n') if 'Mono:' in line][0]
-                        # Extract the percentage value
-                        percentage = int(mono_line.split('[')[1].split('%]')[0])
-                        self._current_volume = percentage
-                        self.logger.info(f"Initial volume state: {self._current_volume}%")
-                    except (IndexError, ValueError) as e:
-                        self.logger.error(f"Error parsing volume output: {e}")
-                        self._current_volume = 50  # Default to 50% if parsing fails
+            cmd = [self.amixer_path, '-M', 'sget', self.mixer_control]
+            # close_fds=False keeps subprocess on its posix_spawn path
+            result = subprocess.run(cmd, capture_output=True,
+                                    timeout=AMIXER_TIMEOUT, close_fds=False)
+            if result.returncode != 0:
+                self.logger.error("Error getting initial volume state: %s",
+                                  result.stderr.decode(errors='replace').strip())
+                return 50  # Default to 50% if amixer fails
+            # First channel's percentage, 'Mono:' or 'Front Left:'
+            match = AMIXER_VOLUME_RE.search(result.stdout)
+            if match:
+                return int(match.group(1))
+            self.logger.error("Error parsing volume output: %r", result.stdout)
+            return 50  # Default to 50% if parsing fails
+        except subprocess.TimeoutExpired:
+            self.logger.error("Volume read timeout")
+            return 50
         except Exception as e:
-            self.logger.error(f"Error getting initial volume state: {e}")
-            self._current_volume = 50  # Default to 50% if command fails
+            self.logger.error("Error getting initial volume state: %s", e)
+            return 50  # Default to 50% if command fails
 
     def _set_volume(self, volume: int) -> bool:
         """Set absolute volume level"""
         volume = max(self.min_volume, min(self.max_volume, volume))  # Clamp value
+        if self._mixer is not None:
+            # Direct mixer ioctl, no amixer fork per volume step
+            try:
+                self._set_mixer_volume(volume)
+                self._current_volume = volume
+                return True
+            except alsaaudio.ALSAAudioError as e:
+                self.logger.error("Volume set error: %s", e)
+                return False
+
+        if self._amixer_set(volume):
+            self._current_volume = volume
+            return True
+        return False
+
+    def _amixer_set(self, volume: int) -> bool:
+        """Write a volume level through amixer"""
         try:
-            cmd = [self.amixer_path, '-M', 'sset', 'PCM', f'{volume}%']
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=5)
+            cmd = [self.amixer_path, '-M', 'sset', self.mixer_control,
+                   f'{volume}%']
+            # Only stderr is read, amixer's control dump goes to /dev/null
+            result = subprocess.run(cmd, stdin=subprocess.DEVNULL,
+                                    stdout=subprocess.DEVNULL,
+                                    stderr=subprocess.PIPE,
+                                    text=True, timeout=AMIXER_TIMEOUT,
+                                    close_fds=False)
             # subprocess.run('play -n synth 0.2 sine 600', capture_output=True, text=True, timeout=0.22)
 
             if result.returncode == 0:
-                self._current_volume = volume
                 return True
             else:
-                self.logger.error(f"Volume set failed: {result.stderr}")
+                self.logger.error("Volume set failed: %s", result.stderr)
                 return False
 
         except subprocess.TimeoutExpired:
             self.logger.error("Volume set timeout")
             return False
         except Exception as e:
-            self.logger.error(f"Volume set error: {e}")
+            self.logger.error("Volume set error: %s", e)
             return False
 
     def _setup_logger(self):
         """Configure dedicated logger for sound system"""
         logger = logging.getLogger('SoundSystem')
         logger.setLevel(logging.INFO)
+        if logger.handlers:
+            # A Klipper RESTART creates a new SoundSystem in the same
+            # process, keep the handler and listener set up the first time
+            return logger
 
         # Create file handler
         log_path = Path('/home/pi/printer_data/logs/sound_system.log')
-        handler = logging.FileHandler(log_path)
+        handler = logging.FileHandler(log_path, delay=True)
         handler.setFormatter(logging.Formatter(
             '%(asctime)s - %(levelname)s - %(message)s'))
 
-        logger.addHandler(handler)
+        # Log calls only enqueue the record, a listener thread does the
+        # file writes so callers never block on the SD card
+        log_queue = queue.SimpleQueue()
+        listener = logging.handlers.QueueListener(log_queue, handler)
+        listener.start()
+        # Write out records still queued when Klippy exits
+        atexit.register(listener.stop)
+
+        logger.addHandler(logging.handlers.QueueHandler(log_queue))
         return logger
 
-    def _get_aplay_path(self):
-        """Find aplay executable path"""
+    def _check_wav_header(self, path,
+                          st: Optional[os.stat_result] = None) -> bool:
+        """Check for a RIFF/WAVE header, cached until mtime or size changes"""
         try:
-            return subprocess.check_output(['which', 'aplay'],
-                                           text=True).strip()
-        except subprocess.SubprocessError as e:
-            self.logger.error(f"Error finding aplay: {e}")
-            return None
+            if st is None:
+                st = os.stat(path)
+            return _read_wav_header(os.fspath(path), st.st_mtime_ns,
+                                    st.st_size)
+        except Exception as e:
+            self.logger.error("Error verifying %s: %s", path, e)
+            return False
 
-    def _get_amixer_path(self):
-        """Find amixer executable path"""
+    def _exists_wav(self, path: str) -> bool:
+        """Check that a sound file exists and has a WAV header"""
+        # One stat() answers "regular file" and keys the header cache, so
+        # a file seen before costs no read
         try:
-            return subprocess.check_output(['which', 'amixer'],
-                                           text=True).strip()
-        except subprocess.SubprocessError as e:
-            self.logger.error(f"Error finding amixer: {e}")
-            return None
+            st = os.stat(path)
+        except OSError:
+            return False
+        return stat.S_ISREG(st.st_mode) and self._check_wav_header(path, st)
 
-    def _verify_sound_file(self, path: Path) -> bool:
-        """Verify file exists and is a valid WAV"""
+    def _refresh_index(self):
+        """Rebuild the sound index if sound_dir changed since the last scan"""
         try:
-            if not path.is_file():
-                return False
+            dir_mtime = os.stat(self.sound_dir).st_mtime_ns
+        except OSError:
+            self._sound_index = {}
+            self._index_mtime = None
+            return
+        if dir_mtime == self._index_mtime:
+            return
 
-            # Basic WAV header check
-            with open(path, 'rb') as f:
-                header = f.read(12)
-                return (header.startswith(b'RIFF') and
-                        header[8:12] == b'WAVE')
-        except Exception as e:
-            self.logger.error(f"Error verifying {path}: {e}")
-            return False
+        index = {}
+        try:
+            with os.scandir(self.sound_dir) as it:
+                for entry in it:
+                    try:
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    # Only WAV files, verified once per file version
+                    if (entry.name.endswith('.wav') and
+                            stat.S_ISREG(st.st_mode) and
+                            self._check_wav_header(entry.path, st)):
+                        index[entry.name] = entry.path
+        except OSError as e:
+            self.logger.error("Error indexing sounds: %s", e)
+            return
+        self._sound_index = index
+        self._index_mtime = dir_mtime
 
-    def _find_sound_file(self, sound_name: str) -> Optional[Path]:
+    def _find_sound_file(self, sound_name: str) -> Optional[str]:
         """Find sound file by name, with or without .wav extension"""
-        sound_path = self.sound_dir / sound_name
+        if '/' not in sound_name:
+            self._refresh_index()
+            sound_path = self._sound_index.get(sound_name)
+            if sound_path is None:
+                wav_name = os.path.splitext(sound_name)[0] + '.wav'
+                sound_path = self._sound_index.get(wav_name)
+            if sound_path is None:
+                # The index only holds *.wav files that were complete when
+                # it was built, check the disk for anything it may miss
+                sound_path = self._lookup_sound_file(
+                    os.path.join(self._sound_dir_str, sound_name))
+            return sound_path
+
+        # Adding, removing or renaming a file bumps its directory's mtime,
+        # so one stat of the directory revalidates a cached lookup
+        cached = self._resolve_cache.get(sound_name)
+        if cached is not None:
+            try:
+                if os.stat(os.path.dirname(cached[1])).st_mtime_ns == cached[0]:
+                    return cached[1]
+            except OSError:
+                pass
+            del self._resolve_cache[sound_name]
+
+        # Stat the directory before the lookup so a change racing with it
+        # invalidates the new entry instead of hiding behind it
+        sound_path = os.path.join(self._sound_dir_str, sound_name)
+        try:
+            dir_mtime = os.stat(os.path.dirname(sound_path)).st_mtime_ns
+        except OSError:
+            return None
+        sound_path = self._lookup_sound_file(sound_path)
+        if sound_path is not None:
+            self._resolve_cache[sound_name] = (dir_mtime, sound_path)
+        return sound_path
 
+    def _lookup_sound_file(self, sound_path: str) -> Optional[str]:
+        """Look up a sound file on disk, with or without .wav extension"""
         # Try exact name first
-        if self._verify_sound_file(sound_path):
+        if self._exists_wav(sound_path):
             return sound_path
 
-        # Try with .wav extension
-        wav_path = sound_path.with_suffix('.wav')
-        if self._verify_sound_file(wav_path):
+        # Try with .wav extension, unless that is the path already checked
+        wav_path = os.path.splitext(sound_path)[0] + '.wav'
+        if wav_path != sound_path and self._exists_wav(wav_path):
             return wav_path
 
         return None
 
-    def _play_sound_thread(self, sound_path: Path):
-        """Handle sound playback in a separate thread"""
+    def _launch_aplay(self, sound_path: str) -> subprocess.Popen:
+        """Start aplay for a sound file"""
+        # aplay reads nothing from stdin and prints nothing useful on
+        # stdout, only stderr is kept for the failure message. As with
+        # mpv, close_fds=False lets subprocess posix_spawn aplay
+        process = subprocess.Popen(
+            self._aplay_argv + (sound_path,),
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            close_fds=False
+        )
+        if self.aplay_priority is not None:
+            # Set from here, a preexec_fn would rule out posix_spawn
+            try:
+                os.setpriority(os.PRIO_PROCESS, process.pid,
+                               self.aplay_priority)
+            except OSError as e:
+                self.logger.warning("Cannot set aplay priority: %s", e)
+        return process
+
+    def _open_pidfd(self, process: subprocess.Popen) -> Optional[int]:
+        """Return a pidfd for the process, or None on older systems"""
+        if not hasattr(os, 'pidfd_open'):
+            return None
         try:
-            # Set flag before starting playback
-            self._sound_playing = True
-            
-            process = subprocess.Popen(
-                [self.aplay_path, '-D', 'plughw:0,0', str(sound_path)],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE
-            )
-
-            # Wait for the process to complete
-            stdout, stderr = process.communicate(timeout=30)  # 30 second timeout
-            if process.returncode != 0:
-                self.logger.error(
-                    f"Play failed (code {process.returncode}): {stderr.decode()}")
-            else:
-                self.logger.debug("Play completed successfully")
+            return os.pidfd_open(process.pid)
+        except OSError:
+            # Kernel older than 5.3
+            return None
 
-        except subprocess.TimeoutExpired:
+    def _start_sound(self, sound_path: str):
+        """Start playback and arrange for aplay's exit to be handled"""
+        # Set flag before starting playback
+        self._sound_playing = True
+        try:
+            process = self._launch_aplay(sound_path)
+        except Exception as e:
+            self.logger.error("Play error: %s", e)
+            self._sound_playing = False
+            return
+        self._sound_process = process
+
+        reactor = self.printer.get_reactor()
+        pidfd = self._open_pidfd(process)
+        if pidfd is None:
+            # No pidfd support, poll for aplay's exit from a reactor timer
+            deadline = reactor.monotonic() + PLAY_TIMEOUT
+
+            def reap(eventtime):
+                nonlocal deadline
+                if process.poll() is None:
+                    if eventtime >= deadline:
+                        self.logger.error("Play timeout - killing process")
+                        process.kill()
+                        deadline = reactor.NEVER
+                    return eventtime + REAP_INTERVAL
+                reactor.unregister_timer(reap_timer)
+                self._collect_sound(process)
+                return reactor.NEVER
+
+            reap_timer = reactor.register_timer(
+                reap, reactor.monotonic() + REAP_INTERVAL)
+            return
+
+        # The pidfd becomes readable when aplay exits, so the reactor's
+        # poll loop reports completion without a waiting thread
+
+        def handle_timeout(eventtime):
             self.logger.error("Play timeout - killing process")
             process.kill()
-            process.communicate()  # Clean up
-        except Exception as e:
-            self.logger.error(f"Play thread error: {e}")
-        finally:
-            # Clear flag after playback is complete or on error
+            return reactor.NEVER
+
+        def handle_exit(eventtime):
+            reactor.unregister_fd(fd_handle)
+            reactor.unregister_timer(timeout_timer)
+            os.close(pidfd)
+            self._collect_sound(process)
+
+        timeout_timer = reactor.register_timer(
+            handle_timeout, reactor.monotonic() + PLAY_TIMEOUT)
+        fd_handle = reactor.register_fd(pidfd, handle_exit)
+
+    def _collect_sound(self, process: subprocess.Popen):
+        """Read the stderr of an exited aplay and finish playback"""
+        # aplay has exited, so the pipe holds all it will ever write
+        stderr = process.stderr.read()
+        process.stderr.close()
+        self._finish_sound(process, stderr)
+
+    def _finish_sound(self, process: subprocess.Popen, stderr: bytes):
+        """Log the aplay result and clear the playback state"""
+        returncode = process.wait()
+        if returncode != 0:
+            self.logger.error("Play failed (code %d): %s",
+                              returncode, stderr.decode())
+        else:
+            self.logger.debug("Play completed successfully")
+
+        # Clear flag after playback is complete or on error, unless a
+        # forced playback has already replaced this process
+        if self._sound_process is process:
+            self._sound_process = None
             self._sound_playing = False
 
+    def _stop_sound(self):
+        """Terminate the aplay process started by this module, if any"""
+        process = self._sound_process
+        if process is None or process.poll() is not None:
+            return
+        process.terminate()
+        try:
+            # Give aplay a moment to release the audio device
+            process.wait(timeout=1)
+        except subprocess.TimeoutExpired:
+            process.kill()
+        self.logger.info("Stopped aplay process: %s", process.pid)
+
     def cmd_PLAY_SOUND(self, gcmd):
         """Handle PLAY_SOUND command"""
         if not self.aplay_path:
@@ -239,26 +647,15 @@ class SoundSystem:
         if force_now and self._sound_playing:
             self.logger.info("Force playing new sound, stopping current playback")
             try:
-                for proc in psutil.process_iter(['pid', 'name']):
-                    if proc.info['name'] == 'aplay':
-                        os.kill(proc.info['pid'], signal.SIGTERM)
-                        self.logger.info(f"Killed existing aplay process: {proc.info['pid']}")
+                self._stop_sound()
                 self._sound_playing = False
             except Exception as e:
-                self.logger.error(f"Error killing existing sound: {e}")
-
-        # Start playback in a separate thread
-        def start_playback(eventtime):
-            # Double-check the flag right before starting the thread, unless NOW is set
-            if not self._sound_playing or force_now:
-                Thread(target=self._play_sound_thread,
-                      args=(sound_path,),
-                      daemon=True).start()
-                gcmd.respond_info(f"Playing sound: {sound_path.name}")
-            return False  # Don't reschedule
+                self.logger.error("Error killing existing sound: %s", e)
 
-        reactor = self.printer.get_reactor()
-        reactor.register_callback(start_playback)
+        # Spawning aplay does not block, so start it straight away instead
+        # of bouncing through a reactor callback
+        self._start_sound(sound_path)
+        gcmd.respond_info(f"Playing sound: {os.path.basename(sound_path)}")
 
     def cmd_SOUND_LIST(self, gcmd):
         """List available sound files"""
@@ -266,80 +663,190 @@ class SoundSystem:
             gcmd.respond_info(f"Sound directory not found: {self.sound_dir}")
             return
 
-        msg = [f"Sound directory: {self.sound_dir}\n", "Available sounds:"]
+        # Header checks touch every file, build the listing off the
+        # reactor thread and respond once it is complete
+        self._io_executor.submit(self._build_list_response, gcmd)
+
+    def _build_list_response(self, gcmd):
+        """Verify sound files and send the SOUND_LIST response"""
+        header = f"Sound directory: {self.sound_dir}\n\nAvailable sounds:"
 
         try:
-            for sound_file in sorted(self.sound_dir.glob("*.wav")):
-                status = "✓" if self._verify_sound_file(sound_file) else "✗"
-                msg.append(f"{status} {sound_file.name}")
+            # Single scandir pass, file type comes from the directory read
+            with os.scandir(self.sound_dir) as it:
+                entries = sorted((e for e in it if e.name.endswith('.wav')),
+                                 key=lambda e: e.name)
+            stats = []
+            for e in entries:
+                try:
+                    stats.append((e, e.stat() if e.is_file() else None))
+                except OSError:
+                    continue  # Removed while listing
+
+            # Reuse the formatted listing while no file was added, removed
+            # or changed since the last SOUND_LIST
+            key = tuple((e.name, st and (st.st_mtime_ns, st.st_size))
+                        for e, st in stats)
+            cached_key, listing = self._list_cache
+            if key != cached_key:
+                lines = []
+                complete = True
+                for e, st in stats:
+                    valid = False
+                    if st is not None:
+                        try:
+                            valid = _read_wav_header(e.path, st.st_mtime_ns,
+                                                     st.st_size)
+                        except OSError as err:
+                            self.logger.error("Error verifying %s: %s",
+                                              e.path, err)
+                            complete = False
+                    lines.append(("✓ " if valid else "✗ ") + e.name)
+                listing = "\n".join(lines)
+                # A failed read may be transient, check again next time
+                if complete:
+                    self._list_cache = (key, listing)
         except Exception as e:
-            self.logger.error(f"Error listing sounds: {e}")
-            msg.append(f"Error: {e}")
+            self.logger.error("Error listing sounds: %s", e)
+            listing = f"Error: {e}"
 
-        gcmd.respond_info("\n".join(msg))
-
-    def cmd_VOLUME_UP(self, gcmd):
-        """Increase PCM volume"""
-        if self._current_volume is None:
+        response = f"{header}\n{listing}" if listing else header
+        reactor = self.printer.get_reactor()
+        reactor.register_async_callback(
+            lambda eventtime: gcmd.respond_info(response))
+
+    def _adjust_volume(self, gcmd, delta: int):
+        """Change the volume by delta percent"""
+        # Only query the mixer once, unless REFRESH=1 asks to pick up
+        # volume changes made outside Klipper
+        if self._current_volume is None or gcmd.get_int('REFRESH', 0):
             self._init_volume_state()
 
-        new_volume = self._current_volume + self.volume_step
-        if self._set_volume(new_volume):
-            gcmd.respond_info(f"Volume set to {self._current_volume}%")
+        new_volume = self._current_volume + delta
+        if self._mixer is not None:
+            if not self._set_volume(new_volume):
+                raise gcmd.error("Volume adjustment failed")
         else:
-            raise gcmd.error("Volume adjustment failed")
+            # Each amixer write is a fork, so rapid presses only update the
+            # cached level and a single trailing write applies the result
+            self._current_volume = max(self.min_volume,
+                                       min(self.max_volume, new_volume))
+            reactor = self.printer.get_reactor()
+            if not self._volume_write_pending:
+                self._volume_write_pending = True
+                reactor.update_timer(self._volume_timer,
+                                     reactor.monotonic() + VOLUME_WRITE_DELAY)
+        gcmd.respond_info(f"Volume set to {self._current_volume}%")
+
+    def _flush_volume(self, eventtime):
+        """Hand the pending volume level to the I/O worker"""
+        self._volume_write_pending = False
+        # amixer can take a while on a busy Pi, wait for it off the
+        # reactor thread. The single worker keeps writes in order
+        self._io_executor.submit(self._write_volume, self._current_volume)
+        return self.printer.get_reactor().NEVER
+
+    def _write_volume(self, volume: int):
+        """Write a volume level through amixer from the I/O worker"""
+        if not self._amixer_set(volume):
+            # Re-read the real level on the next adjustment
+            self.printer.get_reactor().register_async_callback(
+                self._reset_volume_state)
+
+    def _reset_volume_state(self, eventtime):
+        """Forget the cached volume after a failed write"""
+        self._current_volume = None
+
+    def cmd_VOLUME_UP(self, gcmd):
+        """Increase PCM volume"""
+        self._adjust_volume(gcmd, self.volume_step)
 
     def cmd_VOLUME_DOWN(self, gcmd):
         """Decrease PCM volume"""
-        if self._current_volume is None:
-            self._init_volume_state()
+        self._adjust_volume(gcmd, -self.volume_step)
 
-        new_volume = self._current_volume - self.volume_step
-        if self._set_volume(new_volume):
-            gcmd.respond_info(f"Volume set to {self._current_volume}%")
-        else:
-            raise gcmd.error("Volume adjustment failed")
+    @staticmethod
+    def _encode_mpv_command(command) -> bytes:
+        """Encode a command as one line of mpv's JSON IPC protocol"""
+        return json.dumps({'command': command}).encode() + b'\n'
 
-    def _get_mpv_path(self):
-        """Find mpv executable path"""
+    def _mpv_command(self, command) -> bool:
+        """Send a JSON IPC command to the idle mpv instance"""
+        if not isinstance(command, bytes):
+            command = self._encode_mpv_command(command)
         try:
-            return subprocess.check_output(['which', 'mpv'],
-                                        text=True).strip()
-        except subprocess.SubprocessError as e:
-            self.logger.error(f"Error finding mpv: {e}")
-            return None
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.settimeout(MPV_IPC_TIMEOUT)
+                sock.connect(self.mpv_socket)
+                sock.sendall(command)
+            return True
+        except OSError as e:
+            self.logger.debug("mpv IPC command %r failed: %s", command, e)
+            return False
 
-    def _kill_existing_stream(self):
-        """Kill any existing mpv processes"""
+    def _mpv_running(self) -> bool:
+        """Check if the mpv process started by this module is alive"""
+        return (self._stream_process is not None and
+                self._stream_process.poll() is None)
+
+    def _spawn_mpv(self, url):
+        """Start a persistent idle mpv that begins by playing url"""
+        self._quit_mpv()
+        # An mpv left behind by a previous Klipper instance still listens
+        # on the socket, ask it to quit before taking the socket over
+        self._mpv_command(['quit'])
+        os.makedirs(os.path.dirname(self.mpv_socket), mode=0o700,
+                    exist_ok=True)
+
+        # Python's own fds are non-inheritable, so close_fds=False is safe
+        # and lets subprocess use posix_spawn instead of fork()ing the
+        # whole Klipper process
+        self._stream_process = subprocess.Popen(
+            [self.mpv_path, '--idle', '--no-video', '--no-terminal',
+             f'--input-ipc-server={self.mpv_socket}', url],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            close_fds=False
+        )
+        self.logger.info("Started mpv process: %s", self._stream_process.pid)
+
+    def _quit_mpv(self):
+        """Terminate the mpv process started by this module, if any"""
+        process, self._stream_process = self._stream_process, None
+        if process is None:
+            return
+        process.terminate()
         try:
-            for proc in psutil.process_iter(['pid', 'name']):
-                if proc.info['name'] == 'mpv':
-                    os.kill(proc.info['pid'], signal.SIGTERM)
-                    self.logger.info(f"Killed existing mpv process: {proc.info['pid']}")
-        except Exception as e:
-            self.logger.error(f"Error killing existing stream: {e}")
+            # mpv blocked in a network read may ignore SIGTERM
+            process.wait(timeout=1)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+        self.logger.info("Stopped mpv process: %s", process.pid)
+
+    def _play_stream(self, index):
+        """Play the configured stream on the idle mpv, starting mpv if needed"""
+        url = self.stream_urls[index]
+        if not (self._mpv_running() and
+                self._mpv_command(self._stream_commands[index])):
+            self._spawn_mpv(url)
+        self._streaming = True
+        self.logger.info("Started streaming: %s", url)
+
+    def _stop_stream(self):
+        """Stop playback, leaving mpv idle for the next stream"""
+        self._streaming = False
+        if self._mpv_running() and self._mpv_command(MPV_STOP_COMMAND):
+            return
+        self._quit_mpv()
 
-    def _start_stream_thread(self, url):
-        """Handle stream playback in a separate thread"""
-        try:
-            # Kill any existing stream first
-            if self._stream_process:
-                self._stream_process.terminate()
-                self._stream_process.wait()
-            
-            self._kill_existing_stream()  # Cleanup any orphaned processes
-            
-            # Start new stream
-            self._stream_process = subprocess.Popen(
-                [self.mpv_path, url, '--no-video', '--no-terminal'],
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL
-            )
-            self.logger.info(f"Started streaming: {url}")
-            
-        except Exception as e:
-            self.logger.error(f"Stream thread error: {e}")
-            self._stream_process = None
+    def _handle_disconnect(self):
+        """Do not leave the idle mpv running after Klipper shuts down"""
+        self._streaming = False
+        self._quit_mpv()
+        # The worker exits once the queued listing or preload is done
+        self._io_executor.shutdown(wait=False)
 
     def cmd_STREAM_RADIO(self, gcmd):
         """Handle STREAM_RADIO command"""
@@ -349,17 +856,14 @@ class SoundSystem:
         current_time = self.printer.get_reactor().monotonic()
 
         # If stream is running, stop it
-        if self._stream_process:
+        if self._streaming:
             try:
-                self._stream_process.terminate()
-                self._stream_process.wait()
-                self._stream_process = None
-                self._kill_existing_stream()  # Cleanup any orphaned processes
+                self._stop_stream()
                 self.last_stream_stop_time = current_time
                 gcmd.respond_info("Stopped radio stream")
                 return
             except Exception as e:
-                self.logger.error(f"Error stopping stream: {e}")
+                self.logger.error("Error stopping stream: %s", e)
                 self._stream_process = None
 
         # Check if we should move to next stream or reset to current
@@ -373,15 +877,14 @@ class SoundSystem:
 
         # Get current URL
         url = self.stream_urls[self.current_stream_index]
-        
-        def start_stream(eventtime):
-            Thread(target=self._start_stream_thread,
-                  args=(url,),
-                  daemon=True).start()
-            return False  # Don't reschedule
 
-        reactor = self.printer.get_reactor()
-        reactor.register_callback(start_stream)
+        # Switching streams is a socket write to the running mpv
+        try:
+            self._play_stream(self.current_stream_index)
+        except Exception as e:
+            self.logger.error("Stream error: %s", e)
+            self._stream_process = None
+            raise gcmd.error(f"Failed to start radio stream: {e}")
         gcmd.respond_info(f"Starting radio stream ({self.current_stream_index + 1}/{len(self.stream_urls)}): {url}")
 
 
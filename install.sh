@@ -105,7 +105,7 @@ check_directories() {
 install_system_deps() {
     log_message "Installing system dependencies..."
     sudo apt-get update
-    if ! sudo apt-get install -y alsa-utils; then
+    if ! sudo apt-get install -y alsa-utils libasound2-dev; then
         log_error "Error: Failed to install system dependencies"
         exit 1
     fi
@@ -120,6 +120,12 @@ install_python_deps() {
         log_error "Error: Failed to install Python dependencies in Klippy environment"
         return 1
     fi
+
+    # pyalsaaudio is optional and only used by Klippy, the extra falls back
+    # to amixer when it is missing or fails to build
+    if ! "${KLIPPY_ENV}/bin/pip" install "pyalsaaudio>=0.10.0"; then
+        log_warning "pyalsaaudio could not be installed, volume control will use amixer"
+    fi
     
     # Install dependencies in Moonraker virtual environment
     if ! "/home/pi/moonraker-env/bin/pip" install -r "${PLUGIN_DIR}/requirement.txt"; then